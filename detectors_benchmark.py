@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Detectors import JumpCounter, SquatCounter, BendCounter, HandUpDetector
+from pose_generator import PoseGenerator
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "detectors_benchmark_baseline.json")
+
+# Допустимое ухудшение относительно сохранённых значений (0.25 = на 25% медленнее)
+DEFAULT_TOLERANCE = 0.25
+
+# Запас по памяти в байтах: мелкие объекты Python (например, новое число float)
+# иногда попадают в замер, а иногда нет
+ALLOC_SLACK_BYTES = 64
+
+# Минимальная длительность одного замера времени в секундах
+MIN_MEASURE_TIME = 0.2
+
+# Как в игре: до 3 человек в кадре
+PEOPLE_POSITIONS = [0.2, 0.5, 0.8]
+
+
+def make_people(fps, noise):
+    # Каждый человек выполняет все движения, но в своём порядке
+    people = []
+    for seed, center_x in enumerate(PEOPLE_POSITIONS):
+        generator = PoseGenerator(fps=fps, center_x=center_x, noise=noise, seed=seed).stand()
+        moves = [
+            lambda g: g.jump(3),
+            lambda g: g.squat(2),
+            lambda g: g.bend(2),
+            lambda g: g.raise_hands(),
+        ]
+        for i in range(len(moves)):
+            moves[(i + seed) % len(moves)](generator)
+        frames = [landmarks for landmarks in generator.build().frames if landmarks is not None]
+        people.append(frames)
+    return people
+
+
+def reference_work(_, landmarks):
+    # Эталонная нагрузка: чтение точек и небольшие операции numpy, как в детекторах.
+    # Этот код не меняется, поэтому время детекторов в базе хранится относительно него,
+    # и база не зависит от скорости компьютера
+    a = np.array([landmarks[11].x, landmarks[11].y])
+    b = np.array([landmarks[23].x, landmarks[23].y])
+    return float(np.dot(a, b)) + landmarks[15].y - landmarks[16].y
+
+
+def make_cases():
+    # Для каждого детектора: создать состояние и вызвать проверяемый метод на одном кадре
+    return {
+        'JumpCounter.detect_jump': (
+            JumpCounter,
+            lambda counter, landmarks: counter.detect_jump(counter.calculate_hip_height(landmarks)),
+        ),
+        'SquatCounter.update': (SquatCounter, lambda counter, landmarks: counter.update(landmarks)),
+        'BendCounter.update': (BendCounter, lambda counter, landmarks: counter.update(landmarks)),
+        'HandUpDetector.detect_hand_up': (
+            HandUpDetector,
+            lambda detector, landmarks: detector.detect_hand_up(landmarks),
+        ),
+    }
+
+
+def make_timer(factory, call, people):
+    # Как timeit.Timer.autorange: удваиваем число проходов по кадрам, пока замер не займёт
+    # MIN_MEASURE_TIME. Возвращает функцию, которая делает один замер
+    # и отдаёт время в наносекундах на кадр на человека
+    frames = min(len(frames) for frames in people)
+
+    def timed(passes):
+        detectors = [factory() for _ in people]
+        start = time.perf_counter_ns()
+        for _ in range(passes):
+            for i in range(frames):
+                for person_id, person_frames in enumerate(people):
+                    call(detectors[person_id], person_frames[i])
+        return time.perf_counter_ns() - start
+
+    passes = 1
+    while timed(passes) < MIN_MEASURE_TIME * 1e9:
+        passes *= 2
+
+    return lambda: timed(passes) / (passes * frames * len(people))
+
+
+def measure_time(factory, call, people, repeats):
+    # Эталон и детектор замеряются вплотную друг за другом, чтобы оба попали
+    # в одинаковую нагрузку на компьютер. Возвращает лучшее время детектора
+    # и медиану отношения его времени к эталону
+    reference = make_timer(lambda: None, reference_work, people)
+    detector = make_timer(factory, call, people)
+    times = []
+    ratios = []
+    for _ in range(repeats):
+        reference_ns = reference()
+        detector_ns = detector()
+        times.append(detector_ns)
+        ratios.append(detector_ns / reference_ns)
+    return min(times), sorted(ratios)[len(ratios) // 2]
+
+
+def measure_allocations(factory, call, people):
+    # Средний пик временной памяти за один вызов (в байтах)
+    detectors = [factory() for _ in people]
+    total = 0
+    calls = 0
+    tracemalloc.start()
+    try:
+        for person_id, person_frames in enumerate(people):
+            for landmarks in person_frames:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                call(detectors[person_id], landmarks)
+                total += tracemalloc.get_traced_memory()[1] - before
+                calls += 1
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+
+def run(fps, noise, repeats):
+    people = make_people(fps, noise)
+    results = {}
+    for name, (factory, call) in make_cases().items():
+        ns, relative_time = measure_time(factory, call, people, repeats)
+        results[name] = {
+            'ns_per_frame_person': round(ns, 1),
+            'relative_time': round(relative_time, 3),
+            'alloc_bytes_per_update': round(measure_allocations(factory, call, people), 1),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Время сравниваем в долях эталонной нагрузки, а не в наносекундах,
+    # потому что база могла быть сохранена на другом компьютере.
+    # Возвращает True, если найдена регрессия
+    regression = False
+    print(f"{'детектор':32} {'нс/кадр/чел':>12} {'x эталон':>9} {'база':>7} {'байт/вызов':>11} {'база':>7}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        flags = []
+        if base:
+            if result['relative_time'] > base['relative_time'] * (1 + tolerance):
+                flags.append("медленнее")
+            if (result['alloc_bytes_per_update']
+                    > base['alloc_bytes_per_update'] * (1 + tolerance) + ALLOC_SLACK_BYTES):
+                flags.append("больше памяти")
+        base_time = f"{base['relative_time']:.2f}" if base else "-"
+        base_alloc = f"{base['alloc_bytes_per_update']:.0f}" if base else "-"
+        line = (f"{name:32} {result['ns_per_frame_person']:12.0f} {result['relative_time']:9.2f} {base_time:>7} "
+                f"{result['alloc_bytes_per_update']:11.0f} {base_alloc:>7}")
+        if flags:
+            regression = True
+            line += "  РЕГРЕССИЯ: " + ", ".join(flags)
+        print(line)
+    return regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарк детекторов движений")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--noise", type=float, default=0.002)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как новую базу")
+    args = parser.parse_args()
+
+    results = run(args.fps, args.noise, args.repeats)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    regression = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({name: {key: result[key] for key in ('relative_time', 'alloc_bytes_per_update')}
+                       for name, result in results.items()}, f, indent=4)
+            f.write("\n")
+        print(f"База сохранена в {BASELINE_PATH}")
+    elif regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
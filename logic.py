@@ -1,5 +1,7 @@
+import time
 import cv2
 import mediapipe as mp
+import shadow_mode
 from Detectors import JumpCounter, SquatCounter, BendCounter, HandUpDetector
 from mediapipe.tasks.python import vision
 from mediapipe.tasks import python
@@ -13,20 +15,53 @@ mp_drawing = mp.solutions.drawing_utils
 mp_pose = mp.solutions.pose
 
 
-def create_detector():
-    base_options = python.BaseOptions(model_asset_buffer=model_buffer)
+def create_detector(model=None, detection_confidence=0.5):
+    base_options = python.BaseOptions(model_asset_buffer=model or model_buffer)
     options = vision.PoseLandmarkerOptions(
         base_options=base_options,
         running_mode=vision.RunningMode.VIDEO,
         num_poses=3,
-        min_pose_detection_confidence=0.5,
+        min_pose_detection_confidence=detection_confidence,
         min_pose_presence_confidence=0.5,
         min_tracking_confidence=0.5
     )
     return vision.PoseLandmarker.create_from_options(options)
 
 
+def count_movements(pose_landmarks, people):
+    total_jumps = 0
+    total_squats = 0
+    total_bends = 0
+    hands_up_count = 0
+
+    while len(people) < len(pose_landmarks):
+        people.append({
+            'jump_counter': JumpCounter(),
+            'squat_counter': SquatCounter(),
+            'bend_counter': BendCounter(),
+            'hand_up_detector': HandUpDetector(),
+        })
+
+    for person_id, landmarks in enumerate(pose_landmarks):
+        person = people[person_id]
+
+        total_jumps += person['jump_counter'].update(landmarks)
+        total_squats += person['squat_counter'].update(landmarks)
+        total_bends += person['bend_counter'].update(landmarks)
+
+        if person['hand_up_detector'].detect_hand_up(landmarks):
+            hands_up_count += 1
+
+    return total_jumps, total_squats, total_bends, hands_up_count
+
+
 detector = create_detector()
+
+shadow = None
+if shadow_mode.SHADOW_ENABLED:
+    shadow = shadow_mode.ShadowPipeline(create_detector, count_movements)
+    shadow.start()
+
 time_cadr = 0
 
 people_data = []
@@ -45,6 +80,9 @@ def reset_counters():
     detector.close()
     detector = create_detector()
 
+    if shadow is not None:
+        shadow.reset()
+
 
 def movements_counter(external_frame=None, return_data=False):
     global people_data, all_hands_up, time_cadr, round_points, detector
@@ -58,39 +96,19 @@ def movements_counter(external_frame=None, return_data=False):
     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
 
+    start = time.perf_counter()
     detect_result = detector.detect_for_video(mp_image, time_cadr)
+    pose_landmarks = detect_result.pose_landmarks or []
+    total_jumps, total_squats, total_bends, hands_up_count = count_movements(pose_landmarks, people_data)
+    latency = time.perf_counter() - start
 
-    total_jumps = 0
-    total_squats = 0
-    total_bends = 0
-    hands_up_count = 0
-
-    if detect_result.pose_landmarks:
-        num_people = len(detect_result.pose_landmarks)
-
-        while len(people_data) < num_people:
-            people_data.append({
-                'jump_counter': JumpCounter(),
-                'squat_counter': SquatCounter(),
-                'bend_counter': BendCounter(),
-                'hand_up_detector': HandUpDetector(),
-            })
-
-        for person_id in range(num_people):
-            landmarks = detect_result.pose_landmarks[person_id]
-            person = people_data[person_id]
-
-            jumps = person['jump_counter'].update(landmarks)
-            squats = person['squat_counter'].update(landmarks)
-            bends = person['bend_counter'].update(landmarks)
-
-            total_jumps += jumps
-            total_squats += squats
-            total_bends += bends
+    if shadow is not None:
+        shadow.submit(frame_rgb, time_cadr, pose_landmarks, round(latency * 1000, 2))
 
-            if person['hand_up_detector'].detect_hand_up(landmarks):
-                hands_up_count += 1
+    if pose_landmarks:
+        num_people = len(pose_landmarks)
 
+        for landmarks in pose_landmarks:
             from mediapipe.framework.formats import landmark_pb2
             lm_proto = landmark_pb2.NormalizedLandmarkList()
             lm_proto.landmark.extend([
@@ -136,3 +154,5 @@ if __name__ == "__main__":
     cap.release()
     cv2.destroyAllWindows()
     detector.close()
+    if shadow is not None:
+        shadow.stop()
@@ -6,12 +6,16 @@ from PyQt6.QtWidgets import QHBoxLayout
 from random import choice, choices, randint
 import cv2
 import logic as game_logic
+import stream_server
 
 
 class CameraWidget(QWidget):
-    def __init__(self):
+    def __init__(self, spectator_stream=None):
         super().__init__()
 
+        self.spectator_stream = spectator_stream
+        self.problem_text = ""
+
         self.score_label = QLabel("Счёт:")
         self.score_label.setFont(QFont(font_settings, 40))
         self.score_label.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
@@ -82,6 +86,15 @@ class CameraWidget(QWidget):
 
             self.score_label.setText(f"Счёт:\n{self.current_points}")
 
+        if self.spectator_stream is not None:
+            self.spectator_stream.publish(
+                frame,
+                problem=self.problem_text,
+                points=self.frozen_points if self.answer_frozen else self.current_points,
+                verdict=self.verdict_label.text(),
+                answer_frozen=self.answer_frozen
+            )
+
         frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         h, w, ch = frame.shape
         img = QImage(frame.data, w, h, ch * w, QImage.Format.Format_RGB888)
@@ -175,9 +188,19 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
 
+        self.spectator_stream = None
+        if stream_server.STREAM_ENABLED:
+            # Трансляция необязательна: если порт занят, игра работает без неё
+            try:
+                stream = stream_server.SpectatorStream()
+                stream.start()
+                self.spectator_stream = stream
+            except OSError as error:
+                print(f"Трансляция для зрителей не запущена: {error}")
+
         self.menu_screen = MenuScreen(switch_to_game=self.show_game_screen, switch_to_rules=self.show_rules_screen,
                                       exit_app=self.close)
-        self.game_screen = GameScreen(back_to_menu=self.show_menu_screen)
+        self.game_screen = GameScreen(back_to_menu=self.show_menu_screen, spectator_stream=self.spectator_stream)
         self.rules_screen = RulesScreen(back_to_menu=self.show_menu_screen)
 
         self.stack.addWidget(self.menu_screen)
@@ -203,6 +226,13 @@ class MainWindow(QMainWindow):
         else:
             super().keyPressEvent(event)
 
+    def closeEvent(self, event):
+        if self.spectator_stream is not None:
+            self.spectator_stream.stop()
+        if game_logic.shadow is not None:
+            game_logic.shadow.stop()
+        super().closeEvent(event)
+
 
 def simple_problem_generator():
     types = ['+', '-', '*', '/']
@@ -242,7 +272,7 @@ def complicated_problem_generator():
 
 
 class GameScreen(QWidget):
-    def __init__(self, back_to_menu):
+    def __init__(self, back_to_menu, spectator_stream=None):
         super().__init__()
         layout = QVBoxLayout()
         label = QLabel("Экран игры")
@@ -252,7 +282,7 @@ class GameScreen(QWidget):
         self.problem1_label = QLabel()
         self.problem2_label = QLabel()
         self.problem1_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.camera = CameraWidget()
+        self.camera = CameraWidget(spectator_stream=spectator_stream)
         self.camera.setMinimumSize(800, 600)
 
         btn_menu = QPushButton("В меню")
@@ -286,6 +316,7 @@ class GameScreen(QWidget):
 
         self.problem1_label.setFont(problem_font)
         self.problem1_label.setText(problem_text)
+        self.camera.problem_text = problem_text
         self.problem1_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         answer = int(eval(problem_text))
         self.camera.correct_answer = answer
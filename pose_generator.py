@@ -0,0 +1,230 @@
+import math
+
+import numpy as np
+
+# Длины частей тела в нормированных координатах кадра (как у MediaPipe, y направлен вниз)
+TORSO_LENGTH = 0.25
+THIGH_LENGTH = 0.2
+SHIN_LENGTH = 0.2
+ARM_LENGTH = 0.25
+HEAD_SIZE = 0.08
+
+# Расстояние между левой и правой стороной тела (человек стоит боком к камере)
+SIDE_OFFSET = 0.01
+
+# Высота лодыжек, когда человек стоит на земле
+GROUND_Y = 0.95
+
+# Угол в коленях, когда человек стоит (ноги чуть согнуты, как у живого человека)
+STAND_KNEE_ANGLE = 175
+
+# Части тела, которые можно скрыть (номера точек MediaPipe)
+BODY_PARTS = {
+    'face': tuple(range(11)),
+    'left_arm': (13, 15, 17, 19, 21),
+    'right_arm': (14, 16, 18, 20, 22),
+    'left_leg': (25, 27, 29, 31),
+    'right_leg': (26, 28, 30, 32),
+}
+
+# Скрытые точки MediaPipe всё равно возвращает, но с низкой уверенностью
+# и координатами, которые прыгают от кадра к кадру
+HIDDEN_MAX_VISIBILITY = 0.3
+HIDDEN_JITTER = 0.03
+
+
+class Landmark:
+    # Точка позы с теми же полями, что и NormalizedLandmark из MediaPipe
+    __slots__ = ('x', 'y', 'z', 'visibility')
+
+    def __init__(self, x, y, z=0.0, visibility=1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+
+class PoseSequence:
+    def __init__(self, frames, fps, jumps, squats, bends, hands_up):
+        # Кадры: список из 33 точек или None, если человека нет в кадре
+        self.frames = frames
+        self.fps = fps
+
+        # Известные правильные ответы
+        self.jumps = jumps
+        self.squats = squats
+        self.bends = bends
+
+        # Для каждого кадра: True/False - подняты ли руки, None - рука в движении и ответ неоднозначен
+        self.hands_up = hands_up
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class PoseGenerator:
+    def __init__(self, fps=30, center_x=0.5, noise=0.0, seed=0):
+        self.fps = fps
+        self.center_x = center_x
+
+        # Стандартное отклонение шума координат (дрожание распознавания)
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+        # Номера скрытых точек (частичное перекрытие)
+        self.hidden = set()
+
+        self.frames = []
+        self.hands_up = []
+        self.jumps = 0
+        self.squats = 0
+        self.bends = 0
+
+    def _frame_count(self, seconds):
+        return max(1, round(seconds * self.fps))
+
+    def _add_frame(self, lift=0.0, knee_angle=STAND_KNEE_ANGLE, torso_tilt=0.0, arm_raise=(0.0, 0.0),
+                   hands_up=False):
+        self.frames.append(self._make_pose(lift, knee_angle, torso_tilt, arm_raise))
+        self.hands_up.append(hands_up)
+
+    def _make_pose(self, lift, knee_angle, torso_tilt, arm_raise):
+        # lift - подъём над землёй, knee_angle - угол в коленях (градусы),
+        # torso_tilt - наклон корпуса от вертикали (градусы),
+        # arm_raise - (левая, правая) рука от 0 (вниз) до 1 (вверх)
+        x = self.center_x
+        ankle = np.array([x, GROUND_Y - lift])
+
+        # Голень и бедро отклоняются от вертикали на одинаковый угол в разные стороны,
+        # поэтому угол в колене равен 180 - 2 * phi
+        phi = math.radians((180 - knee_angle) / 2)
+        knee = ankle + SHIN_LENGTH * np.array([math.sin(phi), -math.cos(phi)])
+        hip = knee + THIGH_LENGTH * np.array([-math.sin(phi), -math.cos(phi)])
+
+        # Корпус наклоняется в ту же сторону, что и колени
+        tilt = math.radians(torso_tilt)
+        torso_dir = np.array([math.sin(tilt), -math.cos(tilt)])
+        shoulder = hip + TORSO_LENGTH * torso_dir
+
+        head = shoulder + HEAD_SIZE * torso_dir
+
+        points = [None] * 33
+
+        # 0-10: лицо
+        for i in range(11):
+            points[i] = head + np.array([(i % 3 - 1) * 0.01, (i // 3 - 1) * 0.01])
+
+        # Рука поворачивается вокруг плеча: при 0 свисает вертикально вниз,
+        # при 1 вытянута вверх вдоль корпуса
+        for side, raise_amount, indexes in ((-1, arm_raise[0], (13, 15, 17, 19, 21)),
+                                            (1, arm_raise[1], (14, 16, 18, 20, 22))):
+            arm_angle = math.pi * (1 - raise_amount) + tilt * raise_amount
+            arm_dir = np.array([math.sin(arm_angle), -math.cos(arm_angle)])
+            wrist = shoulder + ARM_LENGTH * arm_dir
+            arm_points = (
+                shoulder + ARM_LENGTH / 2 * arm_dir,
+                wrist,
+                wrist + 0.02 * arm_dir,
+                wrist + 0.02 * arm_dir,
+                wrist + 0.01 * arm_dir,
+            )
+            for i, point in zip(indexes, arm_points):
+                points[i] = point + np.array([side * SIDE_OFFSET, 0])
+
+        for left, right, point in (
+            (11, 12, shoulder),
+            (23, 24, hip),
+            (25, 26, knee),
+            (27, 28, ankle),
+            (29, 30, ankle + np.array([-0.01, 0.01])),
+            (31, 32, ankle + np.array([0.03, 0.01])),
+        ):
+            points[left] = point - np.array([SIDE_OFFSET, 0])
+            points[right] = point + np.array([SIDE_OFFSET, 0])
+
+        points = np.array(points)
+        if self.noise:
+            points = points + self.rng.normal(0, self.noise, points.shape)
+
+        visibility = np.ones(len(points))
+        for i in self.hidden:
+            points[i] += self.rng.normal(0, HIDDEN_JITTER, 2)
+            visibility[i] = self.rng.uniform(0, HIDDEN_MAX_VISIBILITY)
+
+        return [Landmark(float(px), float(py), visibility=float(v)) for (px, py), v in zip(points, visibility)]
+
+    def stand(self, seconds=1.0):
+        for _ in range(self._frame_count(seconds)):
+            self._add_frame()
+        return self
+
+    def jump(self, count=1, height=0.08, air_time=0.4, pause=0.5):
+        # Бёдра поднимаются по параболе, как при настоящем прыжке
+        frames = self._frame_count(air_time)
+        for _ in range(count):
+            for i in range(1, frames + 1):
+                t = i / frames
+                self._add_frame(lift=4 * height * t * (1 - t))
+            self.stand(pause)
+            self.jumps += 1
+        return self
+
+    def squat(self, count=1, knee_angle=70, duration=2.0, pause=0.5):
+        frames = self._frame_count(duration)
+        for _ in range(count):
+            for i in range(1, frames + 1):
+                depth = (1 - math.cos(2 * math.pi * i / frames)) / 2
+                self._add_frame(knee_angle=STAND_KNEE_ANGLE - depth * (STAND_KNEE_ANGLE - knee_angle))
+            self.stand(pause)
+            self.squats += 1
+        return self
+
+    def bend(self, count=1, torso_tilt=125, duration=2.0, pause=0.5):
+        # Наклон боком к камере: в кадре видно, как корпус складывается в бёдрах
+        frames = self._frame_count(duration)
+        for _ in range(count):
+            for i in range(1, frames + 1):
+                depth = (1 - math.cos(2 * math.pi * i / frames)) / 2
+                self._add_frame(torso_tilt=depth * torso_tilt)
+            self.stand(pause)
+            self.bends += 1
+        return self
+
+    def raise_hands(self, hold=1.0, move_time=0.3, arms=('left', 'right')):
+        # Поднимаются только руки из arms, остальные остаются внизу.
+        # Пока рука поднимается или опускается, ответ неоднозначен (None)
+        left = 'left' in arms
+        right = 'right' in arms
+
+        def raised(amount):
+            return (amount if left else 0.0, amount if right else 0.0)
+
+        move_frames = self._frame_count(move_time)
+        for i in range(1, move_frames + 1):
+            self._add_frame(arm_raise=raised(i / move_frames), hands_up=None)
+        for _ in range(self._frame_count(hold)):
+            self._add_frame(arm_raise=raised(1.0), hands_up=True)
+        for i in range(1, move_frames + 1):
+            self._add_frame(arm_raise=raised(1 - i / move_frames), hands_up=None)
+        return self
+
+    def hide(self, *parts):
+        # Частичное перекрытие: следующие кадры строятся со скрытыми частями тела,
+        # пока не будет вызван show()
+        for part in parts:
+            self.hidden.update(BODY_PARTS[part])
+        return self
+
+    def show(self):
+        self.hidden = set()
+        return self
+
+    def occlusion(self, seconds=1.0):
+        # Человек пропал из кадра: MediaPipe не возвращает для него точек
+        for _ in range(self._frame_count(seconds)):
+            self.frames.append(None)
+            self.hands_up.append(None)
+        return self
+
+    def build(self):
+        return PoseSequence(list(self.frames), self.fps, self.jumps, self.squats, self.bends, list(self.hands_up))
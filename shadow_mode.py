@@ -0,0 +1,274 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+
+# Теневой режим: вторая (альтернативная) настройка распознавания работает на части кадров
+# параллельно с основной, а её результаты сравниваются с основными и пишутся в журнал.
+# На игру теневой режим не влияет
+SHADOW_ENABLED = False
+
+# Модель для теневого распознавания (None - та же модель, что и в основном)
+SHADOW_MODEL_PATH = "pose_landmarker_lite.task"
+
+# Во сколько раз уменьшать кадр перед теневым распознаванием (1.0 - без изменений)
+SHADOW_INPUT_SCALE = 1.0
+
+# Порог уверенности обнаружения позы для теневого распознавания
+SHADOW_DETECTION_CONFIDENCE = 0.5
+
+# Каждый какой кадр отдавать теневому распознаванию
+SHADOW_SAMPLE_EVERY = 2
+
+# Бюджет: какую долю одного ядра процессора может занимать теневое распознавание
+SHADOW_MAX_LOAD = 0.25
+
+# Журнал сравнения (одна JSON-запись на строку)
+SHADOW_LOG_PATH = "shadow_log.jsonl"
+
+# Приоритет потока теневого распознавания (nice в Linux, THREAD_PRIORITY_LOWEST в Windows)
+LINUX_NICE = 10
+WINDOWS_THREAD_PRIORITY = -2
+
+
+def lower_thread_priority():
+    # Понижает приоритет текущего потока. Если система этого не позволяет, поток работает как обычно
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), WINDOWS_THREAD_PRIORITY)
+        else:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), LINUX_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+class ShadowPipeline:
+    def __init__(self, detector_factory, count_movements, model_path=SHADOW_MODEL_PATH,
+                 input_scale=SHADOW_INPUT_SCALE, detection_confidence=SHADOW_DETECTION_CONFIDENCE,
+                 sample_every=SHADOW_SAMPLE_EVERY, max_load=SHADOW_MAX_LOAD, log_path=SHADOW_LOG_PATH):
+        # detector_factory и count_movements - те же функции, что использует основное распознавание
+        self.detector_factory = detector_factory
+        self.count_movements = count_movements
+
+        self.model = None
+        if model_path is not None:
+            with open(model_path, "rb") as f:
+                self.model = f.read()
+
+        self.input_scale = input_scale
+        self.detection_confidence = detection_confidence
+        self.sample_every = sample_every
+        self.max_load = max_load
+        self.log_path = log_path
+
+        # Последний кадр, который ждёт теневого распознавания
+        self.pending = None
+        self.reset_requested = False
+        self.condition = threading.Condition()
+
+        # До этого момента новые кадры не берутся, чтобы уложиться в бюджет
+        self.resume_at = 0.0
+        self.frames_seen = 0
+
+        self.running = False
+        self.thread = None
+        self.log_file = None
+        self._new_round()
+
+    def _new_round(self):
+        # Статистика текущего раунда. skipped_budget и dropped меняются из игрового потока,
+        # поэтому их сбрасываем только под self.condition
+        self.compared = 0
+        self.disagreements = 0
+        self.skipped_budget = 0
+        self.dropped = 0
+        self.primary_latency = 0.0
+        self.shadow_latency = 0.0
+        self.last_primary = None
+        self.last_shadow = None
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        self.log_file = open(self.log_path, "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
+        self.log_file.close()
+        self.log_file = None
+
+    def reset(self):
+        # Вызывается при сбросе основных счётчиков: теневые счётчики тоже начинают заново
+        with self.condition:
+            self.pending = None
+            self.reset_requested = True
+            self.condition.notify()
+        self.frames_seen = 0
+
+    def submit(self, frame_rgb, timestamp, pose_landmarks, latency_ms):
+        # Вызывается из основного распознавания и никогда его не задерживает:
+        # если теневое распознавание занято или вышло за бюджет, кадр пропускается.
+        # pose_landmarks - точки, найденные основным распознаванием на этом кадре
+        if not self.running:
+            return
+
+        self.frames_seen += 1
+        if self.frames_seen % self.sample_every:
+            return
+
+        with self.condition:
+            if time.perf_counter() < self.resume_at:
+                self.skipped_budget += 1
+                return
+            if self.pending is not None:
+                self.dropped += 1
+            self.pending = (frame_rgb, timestamp, pose_landmarks, latency_ms)
+            self.condition.notify()
+
+    def _worker(self):
+        lower_thread_priority()
+
+        detector = None
+        # Счётчики теневого распознавания
+        people = []
+        # Контрольные счётчики: точки основного распознавания, но только на тех кадрах,
+        # которые обработало теневое. Так расхождения не зависят от того, какие кадры пропущены
+        control_people = []
+
+        while True:
+            summary = None
+            with self.condition:
+                while self.running and self.pending is None and not self.reset_requested:
+                    self.condition.wait()
+                if not self.running:
+                    summary = self._round_summary()
+                    break
+                if self.reset_requested:
+                    summary = self._round_summary()
+                    self._new_round()
+                self.reset_requested = False
+                job = self.pending
+                self.pending = None
+
+            if summary is not None:
+                self._write(summary)
+                if detector is not None:
+                    detector.close()
+                    detector = None
+                people = []
+                control_people = []
+
+            if job is None:
+                continue
+
+            if detector is None:
+                detector = self.detector_factory(model=self.model, detection_confidence=self.detection_confidence)
+
+            frame_rgb, timestamp, primary_landmarks, primary_latency = job
+            start = time.perf_counter()
+            shadow = self._process(detector, people, frame_rgb, timestamp)
+            busy = time.perf_counter() - start
+            shadow['latency_ms'] = round(busy * 1000, 2)
+
+            # Отдыхаем так, чтобы доля занятого времени не превышала бюджет
+            with self.condition:
+                self.resume_at = time.perf_counter() + busy * (1 / self.max_load - 1)
+
+            primary = self._summarize(primary_landmarks, control_people)
+            primary['latency_ms'] = primary_latency
+
+            self._compare(timestamp, primary, shadow)
+
+        if summary is not None:
+            self._write(summary)
+        if detector is not None:
+            detector.close()
+
+    def _process(self, detector, people, frame_rgb, timestamp):
+        if self.input_scale != 1.0:
+            frame_rgb = cv2.resize(frame_rgb, None, fx=self.input_scale, fy=self.input_scale,
+                                   interpolation=cv2.INTER_AREA)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        detect_result = detector.detect_for_video(mp_image, timestamp)
+        return self._summarize(detect_result.pose_landmarks or [], people)
+
+    def _summarize(self, pose_landmarks, people):
+        # Накопленные счётчики и решение «все подняли руки» на этом кадре
+        jumps, squats, bends, hands_up_count = self.count_movements(pose_landmarks, people)
+        return {
+            'people': len(pose_landmarks),
+            'jumps': jumps,
+            'squats': squats,
+            'bends': bends,
+            'hands_up': hands_up_count,
+            'all_hands_up': len(pose_landmarks) > 0 and hands_up_count == len(pose_landmarks),
+        }
+
+    def _compare(self, timestamp, primary, shadow):
+        # Сравниваем не накопленные счётчики, а то, что каждое распознавание насчитало на этом кадре.
+        # Иначе после первого расхождения все следующие кадры тоже считались бы расхождениями
+        primary_frame = self._frame_changes(primary, self.last_primary)
+        shadow_frame = self._frame_changes(shadow, self.last_shadow)
+        differences = [key for key in ('jumps', 'squats', 'bends', 'all_hands_up')
+                       if primary_frame[key] != shadow_frame[key]]
+
+        self.compared += 1
+        self.primary_latency += primary['latency_ms']
+        self.shadow_latency += shadow['latency_ms']
+        self.last_primary = primary
+        self.last_shadow = shadow
+        if differences:
+            self.disagreements += 1
+
+        self._write({
+            'type': "frame",
+            'timestamp': timestamp,
+            'primary': primary_frame,
+            'shadow': shadow_frame,
+            'differences': differences,
+        })
+
+    def _frame_changes(self, current, previous):
+        # Сколько прыжков, приседаний и наклонов добавилось с предыдущего проверенного кадра
+        changes = dict(current)
+        for key in ('jumps', 'squats', 'bends'):
+            changes[key] = current[key] - (previous[key] if previous else 0)
+        return changes
+
+    def _round_summary(self):
+        # Итог раунда: финальные счётчики обоих распознаваний и средние задержки.
+        # Вызывается под self.condition
+        if not self.compared:
+            return None
+
+        return {
+            'type': "round",
+            'compared_frames': self.compared,
+            'disagreeing_frames': self.disagreements,
+            'skipped_budget': self.skipped_budget,
+            'dropped_busy': self.dropped,
+            'primary_latency_ms': round(self.primary_latency / self.compared, 2),
+            'shadow_latency_ms': round(self.shadow_latency / self.compared, 2),
+            'primary_final': self.last_primary,
+            'shadow_final': self.last_shadow,
+        }
+
+    def _write(self, record):
+        self.log_file.write(json.dumps(record) + "\n")
+        self.log_file.flush()
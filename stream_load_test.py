@@ -0,0 +1,132 @@
+import argparse
+import multiprocessing
+import socket
+import threading
+import time
+
+import numpy as np
+
+from stream_server import SpectatorStream
+
+
+def make_frame(width, height, tick):
+    # Синтетический кадр: шум, чтобы JPEG кодировался примерно как настоящее видео
+    rng = np.random.default_rng(tick)
+    frame = rng.integers(0, 256, size=(height // 8, width // 8, 3), dtype=np.uint8)
+    return np.repeat(np.repeat(frame, 8, axis=0), 8, axis=1)
+
+
+def viewer(port, stop_event, received):
+    # Один зритель: читает MJPEG-поток и считает полученные байты
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.sendall(b"GET /stream.mjpg HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    sock.settimeout(0.5)
+    total = 0
+    try:
+        while not stop_event.is_set():
+            try:
+                data = sock.recv(65536)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            total += len(data)
+    finally:
+        sock.close()
+    with received.get_lock():
+        received.value += total
+
+
+def run_viewers(port, count, stop_event, received):
+    # Зрители живут в отдельном процессе, чтобы их CPU не попадал в замер сервера
+    threads = [threading.Thread(target=viewer, args=(port, stop_event, received)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def wait_for_clients(stream, frames, fps, expected):
+    # Сервер узнаёт об ушедшем зрителе только при следующей записи,
+    # поэтому пока ждём, продолжаем отдавать кадры
+    deadline = time.time() + 10
+    tick = 0
+    while len(stream.clients) != expected and time.time() < deadline:
+        stream.publish(frames[tick % len(frames)])
+        tick += 1
+        time.sleep(1 / fps)
+    if len(stream.clients) != expected:
+        raise RuntimeError(f"ожидалось {expected} зрителей, подключено {len(stream.clients)}")
+
+
+def measure(stream, frames, viewers, duration, fps):
+    # Зрители предыдущего замера должны отключиться, иначе они попадут в этот замер
+    wait_for_clients(stream, frames, fps, 0)
+
+    stop_event = multiprocessing.Event()
+    received = multiprocessing.Value('q', 0)
+    process = None
+    if viewers:
+        process = multiprocessing.Process(target=run_viewers, args=(stream.port, viewers, stop_event, received))
+        process.start()
+        wait_for_clients(stream, frames, fps, viewers)
+
+    encoded_before = stream.frames_encoded
+    cpu_before = time.process_time()
+    start = time.perf_counter()
+    tick = 0
+    while time.perf_counter() - start < duration:
+        stream.publish(frames[tick % len(frames)], points=tick)
+        tick += 1
+        time.sleep(1 / fps)
+    cpu_used = time.process_time() - cpu_before
+    encoded = stream.frames_encoded - encoded_before
+
+    stop_event.set()
+    if process is not None:
+        process.join()
+    return cpu_used, encoded, received.value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест трансляции для зрителей")
+    parser.add_argument("--viewers", type=int, nargs="+", default=[5, 10, 25, 50])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    frames = [make_frame(args.width, args.height, tick) for tick in range(10)]
+    stream = SpectatorStream(host="127.0.0.1", port=0)
+    stream.start()
+
+    def percent(cpu):
+        return cpu / args.duration * 100
+
+    try:
+        # Без зрителей кадры не кодируются: это стоимость самого вызова publish
+        idle_cpu, _, _ = measure(stream, frames, 0, args.duration, args.fps)
+        print(f"0 зрителей: CPU {percent(idle_cpu):.1f}%")
+
+        # Один зритель: добавляется кодирование JPEG, которое делается один раз на кадр для всех
+        base_cpu, encoded, _ = measure(stream, frames, 1, args.duration, args.fps)
+        print(f"1 зритель: CPU {percent(base_cpu):.1f}%, кодирование {percent(base_cpu - idle_cpu):.2f}%, "
+              f"закодировано кадров {encoded}")
+
+        # Стоимость каждого следующего зрителя считаем относительно замера с одним зрителем
+        for count in sorted(set(args.viewers) - {0, 1}):
+            cpu, encoded, received = measure(stream, frames, count, args.duration, args.fps)
+            per_viewer = percent(cpu - base_cpu) / (count - 1)
+            print(
+                f"{count} зрителей: CPU {percent(cpu):.1f}%, "
+                f"на каждого следующего зрителя {per_viewer:.2f}%, "
+                f"закодировано кадров {encoded}, "
+                f"отправлено {received / args.duration / 1024 / 1024:.1f} МБ/с"
+            )
+    finally:
+        stream.stop()
+
+
+if __name__ == "__main__":
+    main()
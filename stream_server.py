@@ -0,0 +1,265 @@
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+# Включить локальную трансляцию для зрителей (проектор, другие классы)
+STREAM_ENABLED = False
+STREAM_HOST = "0.0.0.0"
+STREAM_PORT = 8080
+
+# Качество JPEG для трансляции (0-100)
+JPEG_QUALITY = 70
+
+# Сколько кадров может ждать отправки одному зрителю.
+# Если зритель не успевает, самый старый кадр выбрасывается
+CLIENT_BUFFER_SIZE = 2
+
+# Сколько секунд поток зрителя ждёт новый кадр перед проверкой, что сервер ещё работает
+CLIENT_WAIT_TIMEOUT = 1.0
+
+# Сколько секунд можно ждать отправки кадра зрителю. Если зритель подключён,
+# но не читает (уснул ноутбук, пропал Wi-Fi), через это время он отключается
+CLIENT_SEND_TIMEOUT = 5.0
+
+BOUNDARY = "frame"
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Move and Solve</title>
+<style>
+body { margin: 0; background: #000; color: #fff; font-family: sans-serif; display: flex; }
+#info { width: 20%; padding: 20px; font-size: 32px; white-space: pre-line; }
+#video { width: 80%; height: 100vh; object-fit: contain; }
+</style>
+</head>
+<body>
+<div id="info"></div>
+<img id="video" src="/stream.mjpg">
+<script>
+async function refresh() {
+    try {
+        const response = await fetch("/state.json", {cache: "no-store"});
+        const state = await response.json();
+        document.getElementById("info").textContent =
+            state.problem + "\\n\\nСчёт: " + state.points + "\\n\\n" + state.verdict;
+    } catch (e) {}
+}
+setInterval(refresh, 500);
+refresh();
+</script>
+</body>
+</html>
+"""
+
+
+class SpectatorClient:
+    def __init__(self, buffer_size=CLIENT_BUFFER_SIZE):
+        # Очередь кадров зрителя: при переполнении deque сам выбрасывает самый старый кадр
+        self.frames = deque(maxlen=buffer_size)
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def push(self, jpeg):
+        with self.condition:
+            self.frames.append(jpeg)
+            self.condition.notify()
+
+    def pop(self, timeout=CLIENT_WAIT_TIMEOUT):
+        # Возвращает следующий кадр или None, если за timeout кадр не появился
+        with self.condition:
+            if not self.frames and not self.closed:
+                self.condition.wait(timeout)
+            if self.frames:
+                return self.frames.popleft()
+            return None
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+
+class SpectatorStream:
+    def __init__(self, host=STREAM_HOST, port=STREAM_PORT,
+                 jpeg_quality=JPEG_QUALITY, buffer_size=CLIENT_BUFFER_SIZE, send_timeout=CLIENT_SEND_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.jpeg_quality = jpeg_quality
+        self.buffer_size = buffer_size
+        self.send_timeout = send_timeout
+
+        # Последний кадр от игры, который ещё не закодирован
+        self.pending_frame = None
+        self.frame_condition = threading.Condition()
+
+        # Счёт и пример для JSON-ленты
+        self.state = {
+            'problem': "",
+            'points': 0,
+            'verdict': "",
+            'answer_frozen': False,
+        }
+        self.state_lock = threading.Lock()
+
+        self.clients = set()
+        self.clients_lock = threading.Lock()
+
+        # Сколько кадров закодировано (каждый кадр кодируется один раз для всех зрителей)
+        self.frames_encoded = 0
+
+        self.running = False
+        self.server = None
+        self.server_thread = None
+        self.encoder_thread = None
+
+    def start(self):
+        if self.running:
+            return
+
+        # Если порт занят, здесь будет OSError, и трансляция останется выключенной
+        self.server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.server.daemon_threads = True
+        # Если порт был 0, узнаём, какой порт выдала система
+        self.port = self.server.server_address[1]
+        self.running = True
+
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.encoder_thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.server_thread.start()
+        self.encoder_thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+
+        self.running = False
+        with self.frame_condition:
+            self.frame_condition.notify()
+
+        with self.clients_lock:
+            clients = list(self.clients)
+        for client in clients:
+            client.close()
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.encoder_thread.join()
+
+    def publish(self, frame, **state):
+        # Вызывается из игрового цикла: только запоминает кадр и сразу возвращается.
+        # Если кодировщик не успел забрать предыдущий кадр, он заменяется новым
+        if state:
+            with self.state_lock:
+                self.state.update(state)
+
+        if not self.running:
+            return
+
+        with self.frame_condition:
+            self.pending_frame = frame
+            self.frame_condition.notify()
+
+    def get_state_json(self):
+        with self.state_lock:
+            state = dict(self.state)
+        with self.clients_lock:
+            state['viewers'] = len(self.clients)
+        return json.dumps(state, ensure_ascii=False).encode("utf-8")
+
+    def add_client(self):
+        client = SpectatorClient(self.buffer_size)
+        with self.clients_lock:
+            self.clients.add(client)
+        return client
+
+    def remove_client(self, client):
+        with self.clients_lock:
+            self.clients.discard(client)
+        client.close()
+
+    def _encode_loop(self):
+        while True:
+            with self.frame_condition:
+                while self.running and self.pending_frame is None:
+                    self.frame_condition.wait()
+                if not self.running:
+                    return
+                frame = self.pending_frame
+                self.pending_frame = None
+
+            with self.clients_lock:
+                clients = list(self.clients)
+
+            # Если никто не смотрит, кадр не кодируем
+            if not clients:
+                continue
+
+            ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                continue
+            self.frames_encoded += 1
+
+            # Один и тот же JPEG раздаётся всем зрителям
+            jpeg = buffer.tobytes()
+            for client in clients:
+                client.push(jpeg)
+
+    def _make_handler(self):
+        stream = self
+
+        class SpectatorRequestHandler(BaseHTTPRequestHandler):
+            timeout = stream.send_timeout
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/":
+                    self._send_body(INDEX_PAGE.encode("utf-8"), "text/html; charset=utf-8")
+                elif path == "/state.json":
+                    self._send_body(stream.get_state_json(), "application/json; charset=utf-8")
+                elif path == "/stream.mjpg":
+                    self._send_stream()
+                else:
+                    self.send_error(404)
+
+            def _send_body(self, body, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+
+                client = stream.add_client()
+                try:
+                    while stream.running and not client.closed:
+                        jpeg = client.pop()
+                        if jpeg is None:
+                            continue
+                        self.wfile.write(
+                            f"--{BOUNDARY}\r\n"
+                            f"Content-Type: image/jpeg\r\n"
+                            f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                        )
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                except (ConnectionError, TimeoutError):
+                    pass
+                finally:
+                    stream.remove_client(client)
+
+            def log_message(self, format, *args):
+                # Не засоряем консоль игры запросами зрителей
+                pass
+
+        return SpectatorRequestHandler
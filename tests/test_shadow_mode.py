@@ -0,0 +1,213 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+
+from Detectors import JumpCounter, HandUpDetector
+from pose_generator import PoseGenerator
+from shadow_mode import ShadowPipeline
+
+FRAME = np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def count_movements(pose_landmarks, people):
+    # Упрощённый logic.count_movements: в тестах нужны только прыжки и поднятые руки
+    while len(people) < len(pose_landmarks):
+        people.append((JumpCounter(), HandUpDetector()))
+
+    jumps = 0
+    hands_up_count = 0
+    for (jump_counter, hand_up_detector), landmarks in zip(people, pose_landmarks):
+        jumps += jump_counter.update(landmarks)
+        if hand_up_detector.detect_hand_up(landmarks):
+            hands_up_count += 1
+    return jumps, 0, 0, hands_up_count
+
+
+class Result:
+    def __init__(self, pose_landmarks):
+        self.pose_landmarks = pose_landmarks
+
+
+class FakeDetector:
+    def __init__(self, frames, delay=0.0, gate=None):
+        # frames - точки, которые «находит» детектор для каждой метки времени
+        self.frames = frames
+        self.delay = delay
+        self.gate = gate
+        self.entered = threading.Event()
+        self.timestamps = []
+        self.closed = False
+
+    def detect_for_video(self, image, timestamp):
+        self.timestamps.append(timestamp)
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait()
+        time.sleep(self.delay)
+        return Result([self.frames[timestamp]])
+
+    def close(self):
+        self.closed = True
+
+
+def make_pipeline(tmp_path, detectors, **kwargs):
+    def factory(model, detection_confidence):
+        detector = detectors[len(factory.created)]
+        factory.created.append(detector)
+        return detector
+    factory.created = []
+
+    kwargs.setdefault('max_load', 1.0)
+    kwargs.setdefault('sample_every', 1)
+    pipeline = ShadowPipeline(factory, count_movements, model_path=None,
+                              log_path=str(tmp_path / "shadow.jsonl"), **kwargs)
+    pipeline.start()
+    return pipeline
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.001)
+
+
+def read_log(tmp_path):
+    with open(tmp_path / "shadow.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def frames_by_timestamp(sequence):
+    return {timestamp: landmarks for timestamp, landmarks in enumerate(sequence.frames, start=1)}
+
+
+def test_sampling_uses_control_counters(tmp_path):
+    # Теневое распознавание видит те же точки, что и основное, но только каждый 3-й кадр:
+    # расхождений быть не должно, хотя кадры пропущены
+    sequence = PoseGenerator(noise=0.002).stand().jump(4).build()
+    frames = frames_by_timestamp(sequence)
+    detector = FakeDetector(frames)
+    pipeline = make_pipeline(tmp_path, [detector], sample_every=3)
+
+    for timestamp, landmarks in frames.items():
+        pipeline.submit(FRAME, timestamp, [landmarks], 1.0)
+        wait_until(lambda: pipeline.pending is None)
+        wait_until(lambda: pipeline.compared == len(detector.timestamps))
+    pipeline.stop()
+
+    assert detector.timestamps == [t for t in frames if t % 3 == 0]
+    records = read_log(tmp_path)
+    assert all(not record['differences'] for record in records if record['type'] == "frame")
+    summary = records[-1]
+    assert summary['type'] == "round"
+    assert summary['disagreeing_frames'] == 0
+    assert summary['shadow_final']['jumps'] == summary['primary_final']['jumps'] > 0
+
+
+def test_busy_frame_is_replaced(tmp_path):
+    frames = frames_by_timestamp(PoseGenerator().stand(0.2).build())
+    gate = threading.Event()
+    detector = FakeDetector(frames, gate=gate)
+    pipeline = make_pipeline(tmp_path, [detector])
+
+    pipeline.submit(FRAME, 1, [frames[1]], 1.0)
+    detector.entered.wait(5)
+    pipeline.submit(FRAME, 2, [frames[2]], 1.0)
+    pipeline.submit(FRAME, 3, [frames[3]], 1.0)
+    assert pipeline.dropped == 1
+    gate.set()
+    wait_until(lambda: pipeline.compared == 2)
+    pipeline.stop()
+
+    assert detector.timestamps == [1, 3]
+    assert read_log(tmp_path)[-1]['dropped_busy'] == 1
+
+
+def test_budget_skips_frames(tmp_path):
+    # При бюджете 0.5 после кадра, который обрабатывался 50 мс, теневое распознавание отдыхает ещё 50 мс
+    frames = frames_by_timestamp(PoseGenerator().stand(0.2).build())
+    detector = FakeDetector(frames, delay=0.05)
+    pipeline = make_pipeline(tmp_path, [detector], max_load=0.5)
+
+    pipeline.submit(FRAME, 1, [frames[1]], 1.0)
+    wait_until(lambda: pipeline.compared == 1)
+    pipeline.submit(FRAME, 2, [frames[2]], 1.0)
+    assert pipeline.skipped_budget == 1
+    time.sleep(0.06)
+    pipeline.submit(FRAME, 3, [frames[3]], 1.0)
+    wait_until(lambda: pipeline.compared == 2)
+    pipeline.stop()
+
+    assert detector.timestamps == [1, 3]
+    summary = read_log(tmp_path)[-1]
+    assert summary['skipped_budget'] == 1
+    assert summary['shadow_latency_ms'] >= 50
+
+
+def test_reset_writes_round_summary(tmp_path):
+    frames = frames_by_timestamp(PoseGenerator().stand(0.2).build())
+    first = FakeDetector(frames)
+    second = FakeDetector(frames)
+    pipeline = make_pipeline(tmp_path, [first, second])
+
+    for timestamp in (1, 2):
+        pipeline.submit(FRAME, timestamp, [frames[timestamp]], 1.0)
+        wait_until(lambda: pipeline.compared == timestamp)
+    pipeline.reset()
+    wait_until(lambda: first.closed)
+    pipeline.submit(FRAME, 1, [frames[1]], 1.0)
+    wait_until(lambda: second.timestamps == [1])
+    pipeline.stop()
+
+    rounds = [record for record in read_log(tmp_path) if record['type'] == "round"]
+    assert [record['compared_frames'] for record in rounds] == [2, 1]
+    assert second.closed
+
+
+def test_single_miscount_is_one_disagreement(tmp_path):
+    # Теневое распознавание насчитало лишний прыжок в начале, дальше оба видят одно и то же:
+    # расхождение должно быть ровно на одном кадре, хотя итоговые счётчики отличаются
+    primary = frames_by_timestamp(PoseGenerator().stand(0.5).stand(0.9).jump(2).build())
+    shadow = frames_by_timestamp(PoseGenerator().stand(0.5).jump(1).jump(2).build())
+    assert len(primary) == len(shadow)
+    detector = FakeDetector(shadow)
+    pipeline = make_pipeline(tmp_path, [detector])
+
+    for timestamp, landmarks in primary.items():
+        pipeline.submit(FRAME, timestamp, [landmarks], 1.0)
+        wait_until(lambda: pipeline.compared == timestamp)
+    pipeline.stop()
+
+    records = read_log(tmp_path)
+    disagreeing = [record for record in records if record['type'] == "frame" and record['differences']]
+    assert len(disagreeing) == 1
+    assert disagreeing[0]['differences'] == ['jumps']
+    assert disagreeing[0]['shadow']['jumps'] == 1
+    assert disagreeing[0]['primary']['jumps'] == 0
+    summary = records[-1]
+    assert summary['disagreeing_frames'] == 1
+    assert summary['primary_final']['jumps'] == 2
+    assert summary['shadow_final']['jumps'] == 3
+
+
+def test_disagreements_are_reported(tmp_path):
+    # Теневое распознавание видит поднятые руки, а основное - нет
+    standing = frames_by_timestamp(PoseGenerator().stand(0.2).build())
+    raised = frames_by_timestamp(PoseGenerator().raise_hands(hold=0.2, move_time=0.03).build())
+    detector = FakeDetector(raised)
+    pipeline = make_pipeline(tmp_path, [detector])
+
+    pipeline.submit(FRAME, 3, [standing[3]], 1.0)
+    wait_until(lambda: pipeline.compared == 1)
+    pipeline.stop()
+
+    frame, summary = read_log(tmp_path)
+    assert frame['differences'] == ['all_hands_up']
+    assert frame['primary']['all_hands_up'] is False
+    assert frame['shadow']['all_hands_up'] is True
+    assert summary['disagreeing_frames'] == 1
@@ -0,0 +1,109 @@
+import json
+import socket
+import time
+import urllib.request
+
+import numpy as np
+import pytest
+
+from stream_server import SpectatorClient, SpectatorStream
+
+FRAME = np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def stream():
+    stream = SpectatorStream(host="127.0.0.1", port=0, send_timeout=0.5)
+    stream.start()
+    yield stream
+    stream.stop()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.005)
+
+
+def connect_viewer(stream, receive_buffer=None):
+    sock = socket.socket()
+    if receive_buffer is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+    sock.connect(("127.0.0.1", stream.port))
+    sock.settimeout(5)
+    sock.sendall(b"GET /stream.mjpg HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    return sock
+
+
+def read_until_closed(sock):
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
+
+
+def test_client_drops_oldest_frame():
+    client = SpectatorClient(buffer_size=2)
+    for jpeg in (b"1", b"2", b"3"):
+        client.push(jpeg)
+    assert client.pop() == b"2"
+    assert client.pop() == b"3"
+    assert client.pop(timeout=0.01) is None
+
+
+def test_state_json(stream):
+    stream.publish(FRAME, problem="12 + 7", points=15, verdict="", answer_frozen=False)
+    with urllib.request.urlopen(f"http://127.0.0.1:{stream.port}/state.json") as response:
+        state = json.loads(response.read())
+    assert state == {'problem': "12 + 7", 'points': 15, 'verdict': "", 'answer_frozen': False, 'viewers': 0}
+
+
+def test_frame_encoded_once_for_all_viewers(stream):
+    viewers = [connect_viewer(stream) for _ in range(2)]
+    wait_until(lambda: len(stream.clients) == 2)
+
+    for expected in (1, 2, 3):
+        stream.publish(FRAME)
+        wait_until(lambda: stream.frames_encoded == expected)
+    time.sleep(0.05)
+    assert stream.frames_encoded == 3
+
+    # Оба зрителя получают кадры
+    for viewer in viewers:
+        data = b""
+        while data.count(b"Content-Type: image/jpeg") < 1:
+            data += viewer.recv(65536)
+        viewer.close()
+
+
+def test_stop_closes_viewers():
+    stream = SpectatorStream(host="127.0.0.1", port=0)
+    stream.start()
+    viewer = connect_viewer(stream)
+    wait_until(lambda: len(stream.clients) == 1)
+    stream.publish(FRAME)
+
+    stream.stop()
+    data = read_until_closed(viewer)
+    viewer.close()
+    assert data.startswith(b"HTTP/1.0 200")
+    assert not stream.clients
+
+
+def test_stalled_viewer_is_removed(stream):
+    # Зритель подключился, но ничего не читает: после send_timeout сервер его отключает
+    viewer = connect_viewer(stream, receive_buffer=4096)
+    wait_until(lambda: len(stream.clients) == 1)
+
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+    deadline = time.time() + 5
+    while stream.clients and time.time() < deadline:
+        stream.publish(noise)
+        time.sleep(0.01)
+    # Проверяем до close(): закрытие сокета само разорвало бы соединение
+    assert not stream.clients
+    viewer.close()